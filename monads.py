@@ -1,16 +1,23 @@
 # Python doesn't have a Maybe type. Let's make one.
 
+# Everything above the walkthrough is duplicated in monads.pyx for the
+# Cython build. Keep the two in sync.
 
+
+# Just and Nothing aren't meant to be subclassed.
 class Just:
 
+    __slots__ = ("value",)
+    __match_args__ = ("value",)
+
     def __init__(self, x):
         self.value = x
 
     def __str__(self):
-        return "Just(" + str(self.value) + ")"
+        return f"Just({self.value!s})"
 
     def map(self, f):
-        return Just(f(self.value))
+        return _wrap(f(self.value))
 
     def bind(self, f):
         return f(self.value)
@@ -18,289 +25,365 @@ class Just:
 
 class Nothing:
 
-    def __init__(self):
-        self.value = None
+    __slots__ = ()
+
+    value = None
+
+    # Nothing carries no state, so every Nothing() is the same object.
+    def __new__(cls):
+        return _NOTHING
 
     def __str__(self):
         return "Nothing"
 
+    __repr__ = __str__
+
     def map(self, f):
-        return Nothing()
+        return _NOTHING
 
     def bind(self, f):
-        return Nothing()
+        return _NOTHING
+
+
+_NOTHING = object.__new__(Nothing)
 
 
-def MaybeReturn(x):
-    return Just(x)
+# Builds a Just without going through Just.__init__.
+def _wrap(x, _new=object.__new__, _Just=Just):
+    j = _new(_Just)
+    j.value = x
+    return j
 
 
-# These are pretty bad implementations because they're kind of fragile.
-# Just trying to show this an implementation here.
+# Return just puts a value in a Just, so Just itself is our return.
+MaybeReturn = Just
 
-# Let's start with a function that gets a GLID.
 
-# Imagine that this function is doing an asynchronous network operation to
-# get the GLID from Shibboleth
+# Binds each function in turn, same as chaining .bind calls, but stops as
+# soon as a step comes back Nothing.
+def maybe_pipeline(m, fs):
+    for f in fs:
+        if m is _NOTHING:
+            return _NOTHING
+        m = f(m.value)
+    return m
 
-def get_user_glid():
-    return Just("ALBERT")
 
-print(get_user_glid())  # Just(ALBERT)
+# Directory lookups. The walkthrough below explains how these work.
 
-# As an aside, don't forget that data structures like Maybe allow us to
-# use map to apply functions to the data inside without fear of errors.
+# Builds a lookup from one directory column to another. Each key maps to
+# the first row it appears in, like scanning from the top.
+def _lookup(keys, values):
+    idx = {}
+    for i, k in enumerate(keys):
+        idx.setdefault(k, i)
 
-# This is convenient because our getUserGlid seems to be giving us the
-# GLID back in all caps. Gross.
+    # Defaults are read as fast locals rather than through closure cells
+    # or globals. They stay positional so the call itself stays cheap;
+    # don't pass find more than the key.
+    def find(key, _idx=idx, _values=values, _nothing=_NOTHING, _Just=Just):
+        i = _idx.get(key, -1)
+        return _nothing if i < 0 else _Just(_values[i])
+    return find
 
 
-def to_lower(s):
-    return s.lower()
+def get_user_ufid(dir):
+    return _lookup(dir["glid"], dir["ufid"])
 
-print(get_user_glid().map(to_lower))  # Just(albert)
 
-# And it even works if we didn't get a GLID back...
+def get_name(dir):
+    return _lookup(dir["ufid"], dir["name"])
 
-print(Nothing().map(to_lower))  # Nothing
 
-# This seems pretty useful, so let's make that a separate function.
+def get_name_for_glid(dir):
+    return _lookup(dir["glid"], dir["name"])
 
 
-def get_clean_user_glid():
-    return get_user_glid().map(to_lower)
+if __name__ == "__main__":
 
-print(get_clean_user_glid())  # Just(albert)
+    # These are pretty bad implementations because they're kind of fragile.
+    # Just trying to show this an implementation here.
 
-# Maybe gives us a data structure that gives us a representation for
-# Failure (Nothing), but there are other data structures that give us
-# other meanings in other languages (like Haskell).
+    # Let's start with a function that gets a GLID.
 
-# IO --> Side effects like reading from disk or the internet.
-# Either --> Often used to capture reasons for an error.
+    # Imagine that this function is doing an asynchronous network operation to
+    # get the GLID from Shibboleth
 
-# And of course, Python provides us with Arrays.
-# Arrays ([]) --> Multiple data (but they better be of the same type if
-#                 you want to map and don't hate yourself.)
+    def get_user_glid():
+        return Just("ALBERT")
 
-# Okay...Time to make a fake directory.
+    print(get_user_glid())  # Just(ALBERT)
 
-directory = [
-  {"glid": "albert", "ufid": "00000000", "name": "Albert Alligator"},
-  {"glid": "alberta", "ufid": "11111111", "name": "Alberta Alligator"},
-]
+    # As an aside, don't forget that data structures like Maybe allow us to
+    # use map to apply functions to the data inside without fear of errors.
 
-# Basically, we have a list of Person(s).
+    # This is convenient because our getUserGlid seems to be giving us the
+    # GLID back in all caps. Gross.
 
-# We need a function that gets a UFID (if there is one) for a given
-# GLID. Keep in mind that this could fail (if we're given a GLID that
-# doesn't match a person in the directory). That means, we need a
-# Maybe involved to capture the possibility of Failure.
 
+    def to_lower(s):
+        return s.lower()
 
-def get_user_ufid(dir):
-    def find_ufid(gl):
-        for person in dir:
-            if person["glid"] == gl:
-                return Just(person["ufid"])
-        return Nothing()
-    return find_ufid
+    print(get_user_glid().map(to_lower))  # Just(albert)
 
-# Wait. A function that takes and argument and then returns a function?
-# We're using currying here kind of like a function generator. We
-# supply our directory, and in return, we get a function that takes a
-# Gatorlink as an argument and returns a Maybe of a UFID.
+    # And it even works if we didn't get a GLID back...
 
-# Why do it this way? Mostly, that's because I'm allergic to calling
-# data from outside my function scope. I want to pass in my directory
-# to the function.
+    print(Nothing().map(to_lower))  # Nothing
 
-# Incidentally, this makes things easier to unit test as well. We can
-# supply a fake directory to test instead of going out and calling a
-# real world directory.
+    # This seems pretty useful, so let's make that a separate function.
 
-# In our code example, we will frequently want to use our "UF"
-# "directory", so let's use a partial application of a function like a
-# function generator...
 
-get_user_ufid_from_directory = get_user_ufid(directory)
+    def get_clean_user_glid():
+        return get_user_glid().map(to_lower)
 
-# get_user_ufid_from_directory takes a GLID and gives us a Maybe of UFID.
+    print(get_clean_user_glid())  # Just(albert)
 
-print(get_user_ufid_from_directory("alberta"))  # Just(11111111)
+    # Maybe gives us a data structure that gives us a representation for
+    # Failure (Nothing), but there are other data structures that give us
+    # other meanings in other languages (like Haskell).
 
-# But what about if we're trying to get our current user using
-# getUserGlid and then we need to pipe that through
-# getUserUfidFromDirectory to get our UFID?
+    # IO --> Side effects like reading from disk or the internet.
+    # Either --> Often used to capture reasons for an error.
 
-print(
-    get_clean_user_glid()
-    .map(get_user_ufid_from_directory)
-)  # Just(Just(00000000))
+    # And of course, Python provides us with Arrays.
+    # Arrays ([]) --> Multiple data (but they better be of the same type if
+    #                 you want to map and don't hate yourself.)
 
-# (Remember that...
-#    getCleanUserGlid() ==> Just albert
-# )
+    # Okay...Time to make a fake directory.
 
-# We really don't want nested Maybes here. :-\
+    directory = {
+      "glid": ["albert", "alberta"],
+      "ufid": ["00000000", "11111111"],
+      "name": ["Albert Alligator", "Alberta Alligator"],
+    }
 
-# This is where monads are helpful. Monads provide us a way to take
-# a value in a context and apply a function that's going to give us
-# a value in that same context without getting nesting. That's it.
+    # Basically, we have a list for each field, and a Person is whatever
+    # sits at the same position in every list.
 
-print(
-    get_clean_user_glid()
-    .bind(get_user_ufid_from_directory)
-)  # Just(00000000)
+    # We need a function that gets a UFID (if there is one) for a given
+    # GLID. Keep in mind that this could fail (if we're given a GLID that
+    # doesn't match a person in the directory). That means, we need a
+    # Maybe involved to capture the possibility of Failure.
 
-# Suppose we have a function that takes a UFID and gives back a name.
-# But since maybe our users don't have a name in the directory, that
-# could fail, so we know we should have a Maybe Name as our return
-# value.
+    # (get_user_ufid lives up top with Just and Nothing, so it can be
+    # imported without running this walkthrough.)
 
+    # Wait. A function that takes and argument and then returns a function?
+    # We're using currying here kind of like a function generator. We
+    # supply our directory, and in return, we get a function that takes a
+    # Gatorlink as an argument and returns a Maybe of a UFID.
 
-def get_name(dir):
-    def find_name(id):
-        for person in dir:
-            if person["ufid"] == id:
-                return Just(person["name"])
-        return Nothing()
-    return find_name
+    # Why do it this way? Mostly, that's because I'm allergic to calling
+    # data from outside my function scope. I want to pass in my directory
+    # to the function.
+
+    # It also gives us a handy place to do some work up front: we index the
+    # directory by GLID once, when the directory is supplied, so each lookup
+    # is a dictionary hit instead of a walk through every person.
+
+    # Incidentally, this makes things easier to unit test as well. We can
+    # supply a fake directory to test instead of going out and calling a
+    # real world directory.
+
+    # In our code example, we will frequently want to use our "UF"
+    # "directory", so let's use a partial application of a function like a
+    # function generator...
 
-get_name_from_directory = get_name(directory)
+    get_user_ufid_from_directory = get_user_ufid(directory)
 
-print(
-    get_name_from_directory("00000000")
-)  # Just(Albert Alligator)
+    # get_user_ufid_from_directory takes a GLID and gives us a Maybe of UFID.
 
-# Now watch this.
+    print(get_user_ufid_from_directory("alberta"))  # Just(11111111)
 
-print(
-    get_clean_user_glid()
-    .bind(get_user_ufid_from_directory)
-    .bind(get_name_from_directory)
-)  # Just(Albert Alligator)
+    # But what about if we're trying to get our current user using
+    # getUserGlid and then we need to pipe that through
+    # getUserUfidFromDirectory to get our UFID?
 
-# Errors are handled at every step of the way.
+    print(
+        get_clean_user_glid()
+        .map(get_user_ufid_from_directory)
+    )  # Just(Just(00000000))
 
-print(
-    Nothing()
-    .bind(get_user_ufid_from_directory)
-    .bind(get_name_from_directory)
-)  # Nothing
+    # (Remember that...
+    #    getCleanUserGlid() ==> Just albert
+    # )
 
+    # We really don't want nested Maybes here. :-\
 
-def always_fail(x):
-    return Nothing()
+    # This is where monads are helpful. Monads provide us a way to take
+    # a value in a context and apply a function that's going to give us
+    # a value in that same context without getting nesting. That's it.
+
+    print(
+        get_clean_user_glid()
+        .bind(get_user_ufid_from_directory)
+    )  # Just(00000000)
+
+    # Suppose we have a function that takes a UFID and gives back a name.
+    # But since maybe our users don't have a name in the directory, that
+    # could fail, so we know we should have a Maybe Name as our return
+    # value.
+
+    # (get_name is up top too.)
+
+    get_name_from_directory = get_name(directory)
+
+    print(
+        get_name_from_directory("00000000")
+    )  # Just(Albert Alligator)
+
+    # Now watch this.
+
+    print(
+        get_clean_user_glid()
+        .bind(get_user_ufid_from_directory)
+        .bind(get_name_from_directory)
+    )  # Just(Albert Alligator)
+
+    # That chain comes up often enough that maybe_pipeline does the same
+    # thing in one loop.
+
+    print(
+        maybe_pipeline(
+            get_clean_user_glid(),
+            [get_user_ufid_from_directory, get_name_from_directory],
+        )
+    )  # Just(Albert Alligator)
+
+    # And when we don't actually need the UFID along the way, a GLID and a
+    # name sit at the same spot in the directory, so we can go straight from
+    # one to the other in a single lookup.
+
+    # (get_name_for_glid is up top with the others.)
+
+    get_name_for_glid_from_directory = get_name_for_glid(directory)
+
+    print(
+        get_clean_user_glid()
+        .bind(get_name_for_glid_from_directory)
+    )  # Just(Albert Alligator)
+
+    # Errors are handled at every step of the way.
+
+    print(
+        Nothing()
+        .bind(get_user_ufid_from_directory)
+        .bind(get_name_from_directory)
+    )  # Nothing
+
+
+    def always_fail(x):
+        return Nothing()
 
-print(
-    get_clean_user_glid()
-    .bind(always_fail)
-    .bind(get_name_from_directory)
-)  # Nothing
+    print(
+        get_clean_user_glid()
+        .bind(always_fail)
+        .bind(get_name_from_directory)
+    )  # Nothing
 
-# Holy monads!
+    # Holy monads!
 
-# I need to admit something to you. I've oversimplified things a bit.
-# Because monads are based on math, they have to obey certain laws in
-# order to actually be a monad. This may seem weird at first, but
-# it's actually really great because it means that they act very
-# consistently. And that consistency means it's a lot easier to
-# reason about your code.
+    # I need to admit something to you. I've oversimplified things a bit.
+    # Because monads are based on math, they have to obey certain laws in
+    # order to actually be a monad. This may seem weird at first, but
+    # it's actually really great because it means that they act very
+    # consistently. And that consistency means it's a lot easier to
+    # reason about your code.
 
-# The first monad law is called Left Identity. In Haskell, it's
-# usually written as:
-# return a >>= f == f a
+    # The first monad law is called Left Identity. In Haskell, it's
+    # usually written as:
+    # return a >>= f == f a
 
-# So let's try to represent this in Python. Since return is a keyword
-# in Python, let's call our function MaybeReturn.
+    # So let's try to represent this in Python. Since return is a keyword
+    # in Python, let's call our function MaybeReturn.
 
-print(
-    MaybeReturn(5)
-)  # Just(5)
+    print(
+        MaybeReturn(5)
+    )  # Just(5)
 
-# Maybe we do a similar thing for Arrays/Lists...
+    # Maybe we do a similar thing for Arrays/Lists...
 
 
-def ListReturn(x):
-    return [x]
+    def ListReturn(x):
+        return [x]
 
-print(
-    ListReturn(5)
-)  # [5]
+    print(
+        ListReturn(5)
+    )  # [5]
 
-# Return takes the value and puts it into a container or a context.
+    # Return takes the value and puts it into a container or a context.
 
-# So if that first identity law holds then these two things should be
-# equivalent:
+    # So if that first identity law holds then these two things should be
+    # equivalent:
 
-print(
-    get_user_ufid_from_directory("albert")
-)  # Just(00000000)
+    print(
+        get_user_ufid_from_directory("albert")
+    )  # Just(00000000)
 
-print(
-    MaybeReturn("albert").bind(get_user_ufid_from_directory)
-)  # Just(00000000)
+    print(
+        MaybeReturn("albert").bind(get_user_ufid_from_directory)
+    )  # Just(00000000)
 
-# Sweet! It passes the first monad law (Left Identity).
+    # Sweet! It passes the first monad law (Left Identity).
 
-# The second monad law is called Right Identity. In Haskell, it's
-# usually written as:
-# m >>= return == m
+    # The second monad law is called Right Identity. In Haskell, it's
+    # usually written as:
+    # m >>= return == m
 
-# Again, let's try to represent this in Python...
+    # Again, let's try to represent this in Python...
 
-print(
-    Just("albert").bind(MaybeReturn)
-)  # Just(albert)
+    print(
+        Just("albert").bind(MaybeReturn)
+    )  # Just(albert)
 
-# The idea that both the first two laws are getting it is that return
-# doesn't change anything, and it always gives a consistent result --
-# no matter which side it's on.
+    # The idea that both the first two laws are getting it is that return
+    # doesn't change anything, and it always gives a consistent result --
+    # no matter which side it's on.
 
-# Finally, we have the third law: Associativity. In Haskell, it's
-# usually written as:
-# (m >>= f) >>= g == m >>= (\x -> f x >>= g)
+    # Finally, we have the third law: Associativity. In Haskell, it's
+    # usually written as:
+    # (m >>= f) >>= g == m >>= (\x -> f x >>= g)
 
-# Okay. Time to do this in JavaScript.
+    # Okay. Time to do this in JavaScript.
 
-print(
-    (get_clean_user_glid().bind(get_user_ufid_from_directory))
-    .bind(get_name_from_directory)
-)  # Just(Albert Alligator)
+    print(
+        (get_clean_user_glid().bind(get_user_ufid_from_directory))
+        .bind(get_name_from_directory)
+    )  # Just(Albert Alligator)
 
-print(
-    get_clean_user_glid().bind(
-        lambda x: get_user_ufid_from_directory(x).bind(get_name_from_directory)
-    )
-)  # Just(Albert Alligator)
+    print(
+        get_clean_user_glid().bind(
+            lambda x: get_user_ufid_from_directory(x)
+            .bind(get_name_from_directory)
+        )
+    )  # Just(Albert Alligator)
 
-# We're using the inline lambda to let us say, "Whatever the result
-# from `getCleanUserGlid()` is, take that value and apply it to
-# getUserUfidFromDirectory and then bind getNameFromDirectory over
-# that result."
+    # We're using the inline lambda to let us say, "Whatever the result
+    # from `getCleanUserGlid()` is, take that value and apply it to
+    # getUserUfidFromDirectory and then bind getNameFromDirectory over
+    # that result."
 
-# Overall, the third law tells us that we can handle chunk our
-# calculations together however we want as long we we still do the
-# whole thing in order. This is the same as in arithmetic.
+    # Overall, the third law tells us that we can handle chunk our
+    # calculations together however we want as long we we still do the
+    # whole thing in order. This is the same as in arithmetic.
 
-# (1 + 2) + 3
-# 3 + 3
-# 6
+    # (1 + 2) + 3
+    # 3 + 3
+    # 6
 
-# 1 + (2 + 3)
-# 1 + 5
-# 6
+    # 1 + (2 + 3)
+    # 1 + 5
+    # 6
 
-# So for our real definition of a monad, a monad is any data
-# structure that...
+    # So for our real definition of a monad, a monad is any data
+    # structure that...
 
-# * Implements "bind" to let us chain calls that would
-#   otherwise cause context nesting.
+    # * Implements "bind" to let us chain calls that would
+    #   otherwise cause context nesting.
 
-# * Implements "return" to let us wrap any value in a context.
+    # * Implements "return" to let us wrap any value in a context.
 
-# * Obeys the three monad laws: left identity, right identity, and
-#   associativity.
+    # * Obeys the three monad laws: left identity, right identity, and
+    #   associativity.
 
-# So you see, monads are like burritos. :kappa:
+    # So you see, monads are like burritos. :kappa:
@@ -0,0 +1,91 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# The Maybe from monads.py, compiled. See setup.py.
+
+# This duplicates the library half of monads.py; keep the two in sync.
+# Differences: Nothing() builds a new instance here rather than returning
+# a shared one, and the pure-Python call-overhead tricks in monads.py
+# (default-argument captures, _wrap) are left out because Cython already
+# compiles those paths to direct C.
+
+cimport cython
+
+
+@cython.final
+cdef class Just:
+
+    cdef public object value
+
+    __match_args__ = ("value",)
+
+    def __init__(self, x):
+        self.value = x
+
+    def __str__(self):
+        return f"Just({self.value!s})"
+
+    def map(self, f):
+        return Just(f(self.value))
+
+    def bind(self, f):
+        return f(self.value)
+
+
+@cython.final
+cdef class Nothing:
+
+    @property
+    def value(self):
+        return None
+
+    def __str__(self):
+        return "Nothing"
+
+    def __repr__(self):
+        return "Nothing"
+
+    def map(self, f):
+        return _NOTHING
+
+    def bind(self, f):
+        return _NOTHING
+
+
+# Extension types can't hand back a cached instance from Nothing(), but
+# everything in here reuses this one.
+cdef Nothing _NOTHING = Nothing()
+
+
+MaybeReturn = Just
+
+
+def maybe_pipeline(m, fs):
+    for f in fs:
+        if isinstance(m, Nothing):
+            return _NOTHING
+        m = f(m.value)
+    return m
+
+
+# Builds a lookup from one directory column to another. Each key maps to
+# the first row it appears in, like scanning from the top.
+def _lookup(keys, values):
+    idx = {}
+    for i, k in enumerate(keys):
+        idx.setdefault(k, i)
+
+    def find(key):
+        i = idx.get(key, -1)
+        return _NOTHING if i < 0 else Just(values[i])
+    return find
+
+
+def get_user_ufid(dir):
+    return _lookup(dir["glid"], dir["ufid"])
+
+
+def get_name(dir):
+    return _lookup(dir["ufid"], dir["name"])
+
+
+def get_name_for_glid(dir):
+    return _lookup(dir["glid"], dir["name"])
@@ -0,0 +1,11 @@
+from Cython.Build import cythonize
+from setuptools import setup
+
+setup(
+    name="monads",
+    ext_modules=cythonize(
+        "monads.pyx",
+        language_level=3,
+        compiler_directives={"boundscheck": False, "wraparound": False},
+    ),
+)